@@ -1,5 +1,7 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 import plotly.graph_objects as go
 from utils.text_preprocessing import TextPreprocessor
 from utils.network_analysis import NetworkAnalyzer
@@ -15,12 +17,90 @@ st.set_page_config(
 # 세션 상태 초기화
 if 'data' not in st.session_state:
     st.session_state.data = None
-if 'preprocessor' not in st.session_state:
-    st.session_state.preprocessor = TextPreprocessor()
-if 'network_analyzer' not in st.session_state:
-    st.session_state.network_analyzer = NetworkAnalyzer()
-if 'topic_modeler' not in st.session_state:
-    st.session_state.topic_modeler = TopicModeler()
+
+# 전처리기 (Okt JVM을 포함하므로 세션 상태 대신 리소스 캐시로 프로세스 전체에서 공유)
+@st.cache_resource
+def get_preprocessor():
+    """공유 텍스트 전처리기 반환"""
+    return TextPreprocessor()
+
+def read_context_csv(uploaded_file):
+    """CSV에서 Context 컬럼만 로드 (따옴표 안 줄바꿈 허용, 컬럼이 없으면 KeyError)"""
+    table = pa_csv.read_csv(
+        uploaded_file,
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=['Context'],
+            column_types={'Context': pa.string()},
+            strings_can_be_null=True
+        )
+    )
+    return table.to_pandas(types_mapper={pa.string(): pd.StringDtype()}.get)
+
+# 분석 결과 캐시 한도 (모든 세션이 공유하므로 필터 조합마다 결과가 계속 쌓이지 않도록 제한)
+CACHE_MAX_ENTRIES = 32
+CACHE_TTL = '1h'
+
+# 분석 함수 (입력 데이터와 설정값 기준으로 캐싱되어, 같은 입력으로 재실행 시 결과 재사용)
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def extract_review_keywords(contexts, exclude_words, include_words):
+    """텍스트 전처리 및 리뷰별 키워드 추출"""
+    preprocessor = get_preprocessor()
+    texts = [preprocessor.clean_text(text) for text in contexts]
+    texts = [text for text in texts if text.strip()]  # 빈 텍스트 제거
+    
+    return preprocessor.batch_extract_keywords_parallel(texts, exclude_words, include_words)
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def summarize_keywords(contexts, exclude_words, include_words):
+    """분석된 리뷰 수와 추출된 키워드 수"""
+    keywords_per_text = extract_review_keywords(contexts, exclude_words, include_words)
+    
+    return len(keywords_per_text), len({word for keywords in keywords_per_text for word in keywords})
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def run_network_analysis(contexts, exclude_words, include_words, min_frequency):
+    """키워드 네트워크 분석 (중심성 지표, 네트워크 시각화, 노드 수)"""
+    keywords_per_text = extract_review_keywords(contexts, exclude_words, include_words)
+    
+    # 동시출현 행렬 생성
+    cooccurrence, vocabulary = get_preprocessor().get_cooccurrence_from_keywords(keywords_per_text)
+    
+    # 네트워크 분석
+    network_analyzer = NetworkAnalyzer()
+    network_graph = network_analyzer.create_network(cooccurrence, vocabulary, min_frequency)
+    
+    return (
+        network_analyzer.calculate_centrality_metrics(),
+        network_analyzer.create_interactive_network_plot(),
+        len(network_graph.nodes())
+    )
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def run_topic_modeling(contexts, exclude_words, include_words, n_topics):
+    """토픽 모델링 (토픽별 키워드, 토픽 요약, 토픽 분포 시각화)"""
+    keywords_per_text = extract_review_keywords(contexts, exclude_words, include_words)
+    
+    # 토픽 모델링을 위한 문서 준비
+    filtered_tokens = [keywords for keywords in keywords_per_text if keywords]  # 키워드가 있는 경우만
+    
+    if len(filtered_tokens) < 5:  # 최소 5개 문서 필요
+        return None
+    
+    topic_modeler = TopicModeler()
+    if topic_modeler.fit_lda_from_tokens(filtered_tokens, n_topics) is None:
+        return None
+    
+    return (
+        topic_modeler.get_topics_dataframe(),
+        topic_modeler.get_topic_keywords_summary(),
+        topic_modeler.create_topic_distribution_plot()
+    )
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+def to_csv_bytes(df):
+    """결과 DataFrame을 다운로드용 CSV 바이트로 변환 (엑셀 호환 UTF-8 BOM)"""
+    return df.to_csv(index=False).encode('utf-8-sig')
 
 # 메인 제목
 st.title("🏨 숙박 후기 텍스트 분석 대시보드")
@@ -39,7 +119,13 @@ with st.sidebar:
     
     if uploaded_file is not None:
         try:
-            st.session_state.data = pd.read_csv(uploaded_file)
+            try:
+                # 분석에 사용하는 Context 컬럼만 로드 (pyarrow 파서로 빠르게, 메모리 절약)
+                st.session_state.data = read_context_csv(uploaded_file)
+            except KeyError:
+                # Context 컬럼이 없으면 전체를 로드하여 사용 가능한 컬럼 안내
+                uploaded_file.seek(0)
+                st.session_state.data = pd.read_csv(uploaded_file)
             st.success(f"✅ {len(st.session_state.data)} 행의 데이터가 로드되었습니다.")
             
             # Context 컬럼 확인
@@ -75,8 +161,8 @@ with st.sidebar:
     )
     
     # 키워드 리스트 변환
-    exclude_words = [word.strip() for word in exclude_keywords.split(',') if word.strip()] if exclude_keywords else None
-    include_words = [word.strip() for word in include_keywords.split(',') if word.strip()] if include_keywords else None
+    exclude_words = tuple(word.strip() for word in exclude_keywords.split(',') if word.strip()) if exclude_keywords else None
+    include_words = tuple(word.strip() for word in include_keywords.split(',') if word.strip()) if include_keywords else None
     
     # 필터링 상태 표시
     if exclude_words:
@@ -94,48 +180,22 @@ with st.sidebar:
 # 메인 콘텐츠
 if st.session_state.data is not None:
     
-    # 실시간 분석 함수
-    def perform_realtime_analysis():
-        # 텍스트 전처리
-        texts = [st.session_state.preprocessor.clean_text(text) for text in st.session_state.data['Context']]
-        texts = [text for text in texts if text.strip()]  # 빈 텍스트 제거
-        
-        if not texts:
-            return None, None, None, None
-        
-        # 동시출현 행렬 생성
-        cooccurrence = st.session_state.preprocessor.get_cooccurrence_matrix(
-            texts, exclude_words, include_words
-        )
-        
-        # 네트워크 분석
-        network_graph = st.session_state.network_analyzer.create_network(
-            cooccurrence, min_frequency
+    # 분석 실행 (필터/설정이 바뀐 단계만 다시 계산)
+    contexts = st.session_state.data['Context']
+    
+    with st.spinner("실시간 분석 중..."):
+        total_texts, keyword_count = summarize_keywords(
+            contexts, exclude_words, include_words
         )
-        
-        # 토픽 모델링을 위한 텍스트 준비
-        filtered_texts = []
-        for text in texts:
-            keywords = st.session_state.preprocessor.extract_keywords(
-                text, exclude_words, include_words
+        if total_texts:
+            centrality_df, network_fig, node_count = run_network_analysis(
+                contexts, exclude_words, include_words, min_frequency
             )
-            if keywords:  # 키워드가 있는 경우만
-                filtered_texts.append(' '.join(keywords))
-        
-        # 토픽 모델링
-        topic_model = None
-        if len(filtered_texts) >= 5:  # 최소 5개 문서 필요
-            topic_model = st.session_state.topic_modeler.fit_lda_model(
-                filtered_texts, n_topics
+            topic_result = run_topic_modeling(
+                contexts, exclude_words, include_words, n_topics
             )
-        
-        return network_graph, filtered_texts, len(texts), topic_model
-    
-    # 분석 실행
-    with st.spinner("실시간 분석 중..."):
-        network_graph, filtered_texts, total_texts, topic_model = perform_realtime_analysis()
     
-    if network_graph is None:
+    if not total_texts:
         st.warning("⚠️ 분석할 수 있는 데이터가 없습니다. 키워드 필터를 조정해보세요.")
         st.stop()
     
@@ -146,9 +206,9 @@ if st.session_state.data is not None:
     with col2:
         st.metric("📝 분석된 리뷰", total_texts)
     with col3:
-        st.metric("🔗 네트워크 키워드", len(network_graph.nodes()) if network_graph else 0)
+        st.metric("🔗 네트워크 키워드", node_count)
     with col4:
-        st.metric("📊 토픽 수", n_topics if topic_model else 0)
+        st.metric("📊 토픽 수", n_topics if topic_result else 0)
     
     # 결과 표시 탭
     tab1, tab2, tab3 = st.tabs(["🕸️ 네트워크 분석", "📊 토픽 모델링", "📈 분석 결과표"])
@@ -158,11 +218,9 @@ if st.session_state.data is not None:
         st.markdown("키워드 간의 동시출현 관계를 시각화합니다. **키워드를 입력하면 실시간으로 업데이트됩니다!**")
         
         # 네트워크 시각화
-        network_fig = st.session_state.network_analyzer.create_interactive_network_plot()
         st.plotly_chart(network_fig, use_container_width=True)
         
         # 중심성 지표 테이블
-        centrality_df = st.session_state.network_analyzer.calculate_centrality_metrics()
         if not centrality_df.empty:
             st.subheader("📋 키워드 중심성 지표")
             st.markdown("각 키워드의 네트워크 내 영향력을 나타냅니다.")
@@ -182,18 +240,17 @@ if st.session_state.data is not None:
         st.subheader("토픽 모델링 분석")
         st.markdown("LDA 기법을 통해 숨겨진 주제를 발견합니다. **키워드 필터가 실시간 반영됩니다!**")
         
-        if topic_model and len(filtered_texts) >= 5:
+        if topic_result:
+            topics_df, topic_summary, topic_dist_fig = topic_result
+            
             # 토픽 분포 차트
-            topic_dist_fig = st.session_state.topic_modeler.create_topic_distribution_plot()
             st.plotly_chart(topic_dist_fig, use_container_width=True)
             
             # 토픽별 키워드 테이블
-            topics_df = st.session_state.topic_modeler.get_topics_dataframe(n_words=8)
             if not topics_df.empty:
                 st.subheader("📋 토픽별 주요 키워드")
                 
                 # 토픽 요약
-                topic_summary = st.session_state.topic_modeler.get_topic_keywords_summary()
                 for topic_name, keywords in topic_summary.items():
                     st.markdown(f"**{topic_name}**: {keywords}")
                 
@@ -232,9 +289,9 @@ if st.session_state.data is not None:
                 '값': [
                     len(st.session_state.data),
                     total_texts,
-                    len(set([word for text in filtered_texts for word in text.split()])) if filtered_texts else 0,
-                    len(network_graph.nodes()) if network_graph else 0,
-                    n_topics if topic_model else 0
+                    keyword_count,
+                    node_count,
+                    n_topics if topic_result else 0
                 ]
             })
             st.dataframe(analysis_stats, hide_index=True)
@@ -260,28 +317,27 @@ if st.session_state.data is not None:
         st.markdown("### 💾 결과 다운로드")
         
         col1, col2 = st.columns(2)
+        timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M')
         
         with col1:
             # 네트워크 분석 결과 다운로드
             if not centrality_df.empty:
-                csv_network = centrality_df.to_csv(index=False, encoding='utf-8-sig')
                 st.download_button(
                     label="📊 네트워크 분석 결과 다운로드",
-                    data=csv_network,
-                    file_name=f"network_analysis_{pd.Timestamp.now().strftime('%Y%m%d_%H%M')}.csv",
+                    data=to_csv_bytes(centrality_df),
+                    file_name=f"network_analysis_{timestamp}.csv",
                     mime="text/csv"
                 )
         
         with col2:
             # 토픽 모델링 결과 다운로드
-            if topic_model:
-                topics_df = st.session_state.topic_modeler.get_topics_dataframe()
+            if topic_result:
+                topics_df = topic_result[0]
                 if not topics_df.empty:
-                    csv_topics = topics_df.to_csv(index=False, encoding='utf-8-sig')
                     st.download_button(
                         label="📈 토픽 모델링 결과 다운로드",
-                        data=csv_topics,
-                        file_name=f"topic_modeling_{pd.Timestamp.now().strftime('%Y%m%d_%H%M')}.csv",
+                        data=to_csv_bytes(topics_df),
+                        file_name=f"topic_modeling_{timestamp}.csv",
                         mime="text/csv"
                     )
 
@@ -2,20 +2,49 @@ import networkx as nx
 import plotly.graph_objects as go
 import plotly.express as px
 from collections import Counter
+import functools
+import numpy as np
 import pandas as pd
 
+@functools.lru_cache(maxsize=8)
+def _centrality_metrics(weighted_edges):
+    """간선 집합 기준으로 캐싱되는 중심성 지표 계산"""
+    graph = nx.Graph()
+    graph.add_weighted_edges_from(sorted(weighted_edges))
+    
+    degree_cent = nx.degree_centrality(graph)
+    # 매개 중심성은 최대 50개 출발 노드 표본으로 근사 (O(V·E) → O(k·E))
+    betweenness_cent = nx.betweenness_centrality(graph, k=min(50, len(graph)), seed=42)
+    closeness_cent = nx.closeness_centrality(graph)
+    
+    # 연결 그래프는 ARPACK 고유값 분해, 분리된 그래프는 거듭제곱 반복법 사용
+    try:
+        if len(graph) > 2 and nx.is_connected(graph):
+            eigenvector_cent = nx.eigenvector_centrality_numpy(graph)
+        else:
+            eigenvector_cent = nx.eigenvector_centrality(graph, max_iter=1000)
+    except:
+        eigenvector_cent = {node: 0 for node in graph.nodes()}
+    
+    return degree_cent, betweenness_cent, closeness_cent, eigenvector_cent
+
 class NetworkAnalyzer:
     def __init__(self):
         self.graph = None
         
-    def create_network(self, cooccurrence_dict, min_frequency=2):
+    def create_network(self, cooccurrence, vocabulary, min_frequency=2):
         """네트워크 그래프 생성"""
         self.graph = nx.Graph()
         
         # 빈도수가 임계값 이상인 쌍만 추가
-        for (word1, word2), freq in cooccurrence_dict.items():
-            if freq >= min_frequency:
-                self.graph.add_edge(word1, word2, weight=freq)
+        cooccurrence = cooccurrence.tocoo()
+        mask = cooccurrence.data >= min_frequency
+        self.graph.add_weighted_edges_from(
+            (vocabulary[i], vocabulary[j], freq)
+            for i, j, freq in zip(cooccurrence.row[mask].tolist(),
+                                  cooccurrence.col[mask].tolist(),
+                                  cooccurrence.data[mask].tolist())
+        )
         
         return self.graph
     
@@ -25,25 +54,22 @@ class NetworkAnalyzer:
             return pd.DataFrame()
             
         # 다양한 중심성 지표 계산
-        degree_cent = nx.degree_centrality(self.graph)
-        betweenness_cent = nx.betweenness_centrality(self.graph)
-        closeness_cent = nx.closeness_centrality(self.graph)
-        
-        try:
-            eigenvector_cent = nx.eigenvector_centrality(self.graph, max_iter=1000)
-        except:
-            eigenvector_cent = {node: 0 for node in self.graph.nodes()}
+        degree_cent, betweenness_cent, closeness_cent, eigenvector_cent = _centrality_metrics(
+            frozenset(self.graph.edges(data='weight'))
+        )
         
-        # DataFrame으로 정리
-        centrality_df = pd.DataFrame({
-            'keyword': list(degree_cent.keys()),
-            'degree_centrality': list(degree_cent.values()),
-            'betweenness_centrality': list(betweenness_cent.values()),
-            'closeness_centrality': list(closeness_cent.values()),
-            'eigenvector_centrality': list(eigenvector_cent.values())
-        }).round(4)
+        # DataFrame으로 정리 (소수점 4자리 지표이므로 float32로 저장, 연결 중심성 내림차순)
+        nodes = np.array(list(self.graph.nodes()), dtype=object)
+        metrics = {
+            name: np.fromiter((cent[node] for node in nodes), dtype=np.float32, count=len(nodes)).round(4)
+            for name, cent in [('degree_centrality', degree_cent),
+                               ('betweenness_centrality', betweenness_cent),
+                               ('closeness_centrality', closeness_cent),
+                               ('eigenvector_centrality', eigenvector_cent)]
+        }
+        order = np.argsort(-metrics['degree_centrality'], kind='stable')
         
-        return centrality_df.sort_values('degree_centrality', ascending=False)
+        return pd.DataFrame({'keyword': nodes[order], **{name: values[order] for name, values in metrics.items()}})
     
     def create_interactive_network_plot(self):
         """인터랙티브 네트워크 시각화"""
@@ -55,20 +81,24 @@ class NetworkAnalyzer:
                 font=dict(size=16)
             )
         
-        # 레이아웃 계산
-        pos = nx.spring_layout(self.graph, k=3, iterations=50)
+        # 레이아웃 계산 (numpy 기반 Fruchterman-Reingold, 시드 고정으로 재실행 시 동일한 배치)
+        pos = nx.spring_layout(self.graph, k=3, iterations=50, seed=42)
+        
+        # 노드 정보 (위치, 연결도를 한 번에 배열로 구성)
+        nodes = list(self.graph.nodes())
+        degrees = np.array([degree for _, degree in self.graph.degree(nodes)])
+        positions = np.array([pos[node] for node in nodes])
         
-        # 노드 정보
         node_trace = go.Scatter(
-            x=[pos[node][0] for node in self.graph.nodes()],
-            y=[pos[node][1] for node in self.graph.nodes()],
+            x=positions[:, 0],
+            y=positions[:, 1],
             mode='markers+text',
-            text=list(self.graph.nodes()),
+            text=nodes,
             textposition="middle center",
             textfont=dict(size=12, color="white"),
             marker=dict(
-                size=[self.graph.degree(node) * 5 + 15 for node in self.graph.nodes()],
-                color=[self.graph.degree(node) for node in self.graph.nodes()],
+                size=degrees * 5 + 15,
+                color=degrees,
                 colorscale='Viridis',
                 showscale=True,
                 colorbar=dict(title="연결도"),
@@ -78,14 +108,13 @@ class NetworkAnalyzer:
             name='키워드'
         )
         
-        # 엣지 정보
-        edge_x, edge_y = [], []
-        
-        for edge in self.graph.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
+        # 엣지 정보 (시작점, 끝점, NaN 구분점 순서로 채움)
+        node_index = dict(zip(nodes, range(len(nodes))))
+        edge_idx = np.array([(node_index[u], node_index[v]) for u, v in self.graph.edges()]).reshape(-1, 2)
+        edge_x = np.full(3 * len(edge_idx), np.nan)
+        edge_y = np.full(3 * len(edge_idx), np.nan)
+        edge_x[0::3], edge_y[0::3] = positions[edge_idx[:, 0]].T
+        edge_x[1::3], edge_y[1::3] = positions[edge_idx[:, 1]].T
             
         edge_trace = go.Scatter(
             x=edge_x, y=edge_y,
@@ -1,12 +1,41 @@
 import pandas as pd
 import re
+import os
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from konlpy.tag import Okt
 from collections import Counter
+from itertools import chain
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import sparse
+
+# 일괄 형태소 분석 시 문서 경계 표시용 토큰 (clean_text 이후 텍스트에는 등장하지 않음)
+DOC_SEPARATOR = '|||'
+
+# 형태소 분석 캐시 최대 문서 수 (전처리기가 여러 세션에서 공유되므로 무한히 커지지 않도록 제한)
+MORPH_CACHE_SIZE = 100000
+
+# 병렬 형태소 분석을 사용할 최소 미분석 문서 수 (워커마다 JVM을 새로 띄우는 비용이 있음)
+PARALLEL_MIN_TEXTS = 5000
+
+def _worker_morphs(texts):
+    """워커 프로세스에서 문서 묶음의 형태소 일괄 분석"""
+    return TextPreprocessor().batch_morphs(texts)
 
 class TextPreprocessor:
     def __init__(self):
         self.okt = Okt()
+        self._morph_cache = {}
+        
+        # 기본 불용어
+        self._base_stopwords = frozenset({'이', '그', '저', '것', '수', '있', '하', '되', '같', '들', 
+                                          '많', '좋', '잘', '매우', '정말', '너무', '아주', '완전', '진짜', '한번', '조금'})
+        
+        # clean_text용 패턴 (숫자 삭제 테이블, 특수문자/공백 연속 구간 → 공백 1개)
+        self._digits = str.maketrans('', '', '0123456789０１２３４５６７８９')
+        self._nonword = re.compile(r'\W+')
         
     def clean_text(self, text):
         """기본 텍스트 정리"""
@@ -14,53 +43,175 @@ class TextPreprocessor:
             return ""
         
         # 특수문자, 숫자 제거
-        text = re.sub(r'[^\w\s]', ' ', str(text))
-        text = re.sub(r'\d+', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        return self._nonword.sub(' ', str(text).translate(self._digits)).strip()
+    
+    def _morph_cached(self, text):
+        """형태소 분석 결과 캐싱 (텍스트별 1회만 분석)"""
+        morphs = self._morph_cache.get(text)
+        if morphs is None:
+            morphs = tuple(self.okt.morphs(text, norm=True, stem=True))
+            self._store_morphs({text: morphs})
+        return morphs
+    
+    def _lookup_morphs(self, texts):
+        """캐시에 있는 형태소 분석 결과와 분석이 필요한 텍스트 목록 반환"""
+        found, pending = {}, []
+        
+        # 다른 세션이 캐시를 비울 수 있으므로 조회 결과는 지역 사전에 보관
+        for text in dict.fromkeys(texts):
+            if not text:
+                continue
+            morphs = self._morph_cache.get(text)
+            if morphs is None:
+                pending.append(text)
+            else:
+                found[text] = morphs
         
-        return text
+        return found, pending
+    
+    def _store_morphs(self, new_morphs):
+        """형태소 분석 결과를 캐시에 저장 (최대 크기를 넘으면 비운 뒤 저장)"""
+        if len(self._morph_cache) + len(new_morphs) > MORPH_CACHE_SIZE:
+            self._morph_cache.clear()
+        self._morph_cache.update(new_morphs)
+    
+    def batch_morphs(self, texts):
+        """여러 문서를 한 번의 형태소 분석 호출로 처리"""
+        found, pending = self._lookup_morphs(texts)
+        
+        if pending:
+            # 문서를 구분자로 이어 붙여 JVM 호출을 1회로 줄임
+            morphs = self.okt.morphs(f' {DOC_SEPARATOR} '.join(pending), norm=True, stem=True)
+            
+            # 구분자 기준으로 문서별 형태소 복원
+            docs = [[]]
+            for morph in morphs:
+                if morph == DOC_SEPARATOR:
+                    docs.append([])
+                else:
+                    docs[-1].append(morph)
+            
+            if len(docs) == len(pending):
+                new_morphs = {text: tuple(doc) for text, doc in zip(pending, docs)}
+            else:
+                # 구분자가 온전히 보존되지 않은 경우 문서별 분석으로 대체
+                new_morphs = {text: tuple(self.okt.morphs(text, norm=True, stem=True)) for text in pending}
+            
+            found.update(new_morphs)
+            self._store_morphs(new_morphs)
+        
+        return [found[text] if text else () for text in texts]
     
     def extract_keywords(self, text, exclude_words=None, include_words=None):
         """키워드 추출 및 필터링"""
         if not text:
             return []
+        
+        # 포함할 키워드가 없는 문장은 형태소 분석 전에 제외
+        if include_words and not self._include_pattern(tuple(include_words)).search(text):
+            return []
             
         # 형태소 분석
-        morphs = self.okt.morphs(text, norm=True, stem=True)
+        morphs = self._morph_cached(text)
         
-        # 불용어 제거
-        stopwords = {'이', '그', '저', '것', '수', '있', '하', '되', '같', '들', 
-                    '많', '좋', '잘', '매우', '정말', '너무', '아주', '완전', '진짜', '한번', '조금'}
+        return self._filter_keywords(morphs, self._stopwords(exclude_words))
+    
+    def batch_extract_keywords(self, texts, exclude_words=None, include_words=None):
+        """여러 문서의 키워드를 일괄 추출 및 필터링"""
+        texts = self._apply_include_filter(texts, include_words)
         
-        if exclude_words:
-            stopwords.update(exclude_words)
+        morphs_per_text = self.batch_morphs(texts)
+        stopwords = self._stopwords(exclude_words)
         
+        return [self._filter_keywords(morphs, stopwords) for morphs in morphs_per_text]
+    
+    def batch_extract_keywords_parallel(self, texts, exclude_words=None, include_words=None, max_workers=None):
+        """미분석 문서가 많으면 여러 프로세스로 형태소 분석 후 키워드 일괄 추출"""
+        max_workers = max_workers or os.cpu_count() or 1
+        texts = self._apply_include_filter(texts, include_words)
+        found, pending = self._lookup_morphs(texts)
+        
+        if max_workers < 2 or len(pending) < PARALLEL_MIN_TEXTS:
+            morphs_per_text = self.batch_morphs(texts)
+        else:
+            # 캐시에 없는 문서만 워커마다 한 묶음씩 배분 (묶음 내부는 batch_morphs로 JVM 1회 호출)
+            chunk_size = -(-len(pending) // max_workers)
+            chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+            
+            # JVM이 실행 중인 프로세스를 fork하면 워커가 멈출 수 있으므로 spawn 방식 사용
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                new_morphs = dict(zip(pending, chain.from_iterable(executor.map(_worker_morphs, chunks))))
+            
+            found.update(new_morphs)
+            self._store_morphs(new_morphs)
+            morphs_per_text = [found[text] if text else () for text in texts]
+        
+        stopwords = self._stopwords(exclude_words)
+        
+        return [self._filter_keywords(morphs, stopwords) for morphs in morphs_per_text]
+    
+    def _apply_include_filter(self, texts, include_words=None):
+        """포함할 키워드가 없는 문장은 빈 문자열로 바꿔 형태소 분석 대상에서 제외"""
+        if not include_words:
+            return texts
+        
+        include_pattern = self._include_pattern(tuple(include_words))
+        return [text if include_pattern.search(text) else '' for text in texts]
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _include_pattern(include_words):
+        """포함 키워드 중 하나라도 찾는 정규식 (대소문자 무시, 키워드 조합별 1회 컴파일)"""
+        return re.compile('|'.join(map(re.escape, include_words)), re.IGNORECASE)
+    
+    def _stopwords(self, exclude_words=None):
+        """기본 불용어에 제외 키워드를 더한 불용어 집합"""
+        if exclude_words:
+            return self._base_stopwords | frozenset(exclude_words)
+        return self._base_stopwords
+    
+    def _filter_keywords(self, morphs, stopwords):
+        """형태소 분석 결과에서 불용어와 1글자 단어 제거"""
         # 길이가 2 이상인 키워드만 추출
         keywords = [word for word in morphs 
                    if len(word) >= 2 and word not in stopwords]
         
-        # 포함할 키워드가 있으면 해당 키워드를 포함한 문장의 키워드만 추출
-        if include_words:
-            original_text = str(text).lower()
-            if not any(inc.lower() in original_text for inc in include_words):
-                return []
-        
         return keywords
     
     def get_cooccurrence_matrix(self, texts, exclude_words=None, include_words=None, window_size=5):
         """동시출현 행렬 생성"""
-        cooccurrence = {}
+        keywords_per_text = self.batch_extract_keywords(texts, exclude_words, include_words)
+        return self.get_cooccurrence_from_keywords(keywords_per_text, window_size)
+    
+    def get_cooccurrence_from_keywords(self, keywords_per_text, window_size=5):
+        """추출된 키워드 리스트로 동시출현 행렬 생성 (희소 행렬, 키워드 목록 반환)"""
+        # 키워드별 정수 ID 부여 (등장 순서 유지), 전체 문서를 하나의 ID 배열로 연결
+        vocabulary = list(dict.fromkeys(chain.from_iterable(keywords_per_text)))
+        word_to_id = dict(zip(vocabulary, range(len(vocabulary))))
+        # ID 배열은 int32로 유지해 윈도우/마스크 연산의 메모리 사용량을 절반으로 줄임
+        ids = np.fromiter(map(word_to_id.__getitem__, chain.from_iterable(keywords_per_text)), dtype=np.int32)
+        doc_ids = np.repeat(np.arange(len(keywords_per_text), dtype=np.int32),
+                            [len(keywords) for keywords in keywords_per_text])
         
-        for text in texts:
-            keywords = self.extract_keywords(text, exclude_words, include_words)
-            
-            # 윈도우 내 키워드 쌍 추출
-            for i, word1 in enumerate(keywords):
-                for j in range(max(0, i-window_size), min(len(keywords), i+window_size+1)):
-                    if i != j:
-                        word2 = keywords[j]
-                        pair = tuple(sorted([word1, word2]))
-                        cooccurrence[pair] = cooccurrence.get(pair, 0) + 1
-        
-        return cooccurrence
-
+        n_words = len(vocabulary)
+        
+        if len(ids) < 2:
+            return sparse.csr_matrix((n_words, n_words), dtype=np.int32), vocabulary
+        
+        # 윈도우 내 키워드 쌍 추출: 위치마다 뒤따르는 window_size개 이웃을 한 번에 구성
+        # (배열 끝은 -1로 채우고, 다른 문서의 이웃과 채운 값은 문서 ID 비교로 제외)
+        padding = np.full(window_size, -1, dtype=np.int32)
+        windows = sliding_window_view(np.concatenate([ids, padding]), window_size + 1)
+        doc_windows = sliding_window_view(np.concatenate([doc_ids, padding]), window_size + 1)
+        same_doc = doc_windows[:, 1:] == doc_windows[:, :1]
+        
+        rows = np.broadcast_to(windows[:, :1], same_doc.shape)[same_doc]
+        cols = windows[:, 1:][same_doc]
+        
+        # 상삼각 행렬로 정규화, 양방향 출현을 모두 세므로 쌍마다 2씩 누적 (중복 쌍은 tocsr에서 합산)
+        cooccurrence = sparse.coo_matrix(
+            (np.full(len(rows), 2, dtype=np.int32), (np.minimum(rows, cols), np.maximum(rows, cols))),
+            shape=(n_words, n_words)
+        ).tocsr()
+        
+        return cooccurrence, vocabulary
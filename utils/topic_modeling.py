@@ -1,5 +1,6 @@
-from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
+from gensim import corpora
+from gensim.models import LdaModel
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
@@ -11,7 +12,8 @@ import base64
 class TopicModeler:
     def __init__(self):
         self.lda_model = None
-        self.vectorizer = None
+        self.dictionary = None
+        self._feature_names = None
         self.doc_topic_matrix = None
         
     def fit_lda_model(self, texts, n_topics=5, max_features=100):
@@ -19,55 +21,69 @@ class TopicModeler:
         if not texts or all(not text.strip() for text in texts):
             return None
             
-        # 벡터화
-        self.vectorizer = CountVectorizer(
-            max_features=max_features,
-            min_df=2,
-            max_df=0.8,
-            token_pattern=r'\b\w{2,}\b'
-        )
+        tokenized_texts = [[word for word in text.split() if len(word) >= 2] for text in texts]
+        return self.fit_lda_from_tokens(tokenized_texts, n_topics, max_features)
+    
+    def fit_lda_from_tokens(self, token_lists, n_topics=5, max_features=100):
+        """토큰화된 문서로 LDA 토픽 모델링 (문자열 결합/재분리 없이 사용)"""
+        if not token_lists or not any(token_lists):
+            return None
+            
+        # 단어 사전 구축 (최소 2개 문서, 전체 문서의 80% 이하에 등장)
+        self.dictionary = corpora.Dictionary(token_lists)
+        self.dictionary.filter_extremes(no_below=2, no_above=0.8, keep_n=max_features)
+        self._feature_names = np.array([self.dictionary[i] for i in range(len(self.dictionary))])
         
         try:
-            doc_term_matrix = self.vectorizer.fit_transform(texts)
+            bow_corpus = [self.dictionary.doc2bow(tokens) for tokens in token_lists]
             
-            if doc_term_matrix.sum() == 0:
+            if not any(bow_corpus):
                 return None
                 
-            # LDA 모델 훈련
-            self.lda_model = LatentDirichletAllocation(
-                n_components=n_topics,
-                random_state=42,
-                max_iter=20
+            # LDA 모델 훈련 (온라인 변분 추론, 단일 프로세스)
+            # 워커 프로세스를 fork하면 Okt JVM과 서버 스레드가 있는 프로세스가 복제되어 멈출 수 있고,
+            # 워커 결과 병합 순서에 따라 같은 입력에서도 토픽이 달라지므로 직렬 모델 사용
+            self.lda_model = LdaModel(
+                corpus=bow_corpus,
+                id2word=self.dictionary,
+                num_topics=n_topics,
+                decay=0.7,
+                passes=5,
+                eval_every=None,  # 학습 중 perplexity 계산 생략
+                random_state=42
             )
             
-            self.doc_topic_matrix = self.lda_model.fit_transform(doc_term_matrix)
+            # 문서별 토픽 분포 (전체 문서를 한 번에 추론한 gamma를 행별로 정규화)
+            gamma = self.lda_model.inference(bow_corpus)[0]
+            self.doc_topic_matrix = gamma / gamma.sum(axis=1, keepdims=True)
             return self.lda_model
             
         except Exception as e:
             print(f"LDA 모델 훈련 오류: {e}")
             return None
     
+    def _top_words_idx(self, topic_word, n_words):
+        """토픽별 상위 n개 단어 인덱스 (가중치 내림차순, 모든 토픽을 전체 정렬 없이 한 번에 선택)"""
+        idx = np.argpartition(-topic_word, n_words - 1, axis=1)[:, :n_words]
+        order = np.argsort(-np.take_along_axis(topic_word, idx, axis=1), axis=1)
+        return np.take_along_axis(idx, order, axis=1)
+    
     def get_topics_dataframe(self, n_words=10):
         """토픽별 주요 키워드 DataFrame 반환"""
-        if not self.lda_model or not self.vectorizer:
+        if not self.lda_model or not self.dictionary:
             return pd.DataFrame()
             
-        feature_names = self.vectorizer.get_feature_names_out()
-        topics_data = []
+        topic_word = self.lda_model.get_topics()
+        n_words = min(n_words, len(self._feature_names))
         
-        for topic_idx, topic in enumerate(self.lda_model.components_):
-            top_words_idx = topic.argsort()[-n_words:][::-1]
-            top_words = [feature_names[i] for i in top_words_idx]
-            top_weights = [topic[i] for i in top_words_idx]
-            
-            for word, weight in zip(top_words, top_weights):
-                topics_data.append({
-                    'topic': f'토픽 {topic_idx + 1}',
-                    'keyword': word,
-                    'weight': round(weight, 4)
-                })
+        all_idx = self._top_words_idx(topic_word, n_words)
+        all_weights = np.take_along_axis(topic_word, all_idx, axis=1)
         
-        return pd.DataFrame(topics_data)
+        return pd.DataFrame({
+            'topic': np.repeat([f'토픽 {topic_idx + 1}' for topic_idx in range(len(topic_word))], n_words),
+            'keyword': self._feature_names[all_idx].ravel(),
+            'weight': all_weights.ravel().astype(float).round(4)
+        })
     
     def create_topic_distribution_plot(self):
         """토픽 분포 시각화"""
@@ -102,16 +118,9 @@ class TopicModeler:
     
     def get_topic_keywords_summary(self):
         """토픽별 키워드 요약"""
-        if not self.lda_model or not self.vectorizer:
+        if not self.lda_model or not self.dictionary:
             return {}
             
-        feature_names = self.vectorizer.get_feature_names_out()
-        topic_summary = {}
+        topics_df = self.get_topics_dataframe(n_words=5)  # 상위 5개만
         
-        for topic_idx, topic in enumerate(self.lda_model.components_):
-            top_words_idx = topic.argsort()[-5:][::-1]  # 상위 5개만
-            top_words = [feature_names[i] for i in top_words_idx]
-            topic_summary[f'토픽 {topic_idx + 1}'] = ', '.join(top_words)
-            
-        return topic_summary
-
+        return topics_df.groupby('topic', sort=False)['keyword'].agg(', '.join).to_dict()